@@ -938,6 +938,8 @@ def _aggregate_by_strike(
         call_doi_chg = {}
         put_jpx_vol = {}
         call_jpx_vol = {}
+        put_jpx_total = 0
+        call_jpx_total = 0
 
         for td in week.trading_days:
             pv = vol_agg.get((td, "PUT", strike), 0)
@@ -958,12 +960,14 @@ def _aggregate_by_strike(
                 put_doi_chg[td] = p_bal.net_change
                 if p_bal.trading_volume > 0:
                     put_jpx_vol[td] = p_bal.trading_volume
+                    put_jpx_total += p_bal.trading_volume
             c_bal = oi_bal_lookup.get((td, "CALL", strike))
             if c_bal:
                 call_doi[td] = c_bal.current_oi
                 call_doi_chg[td] = c_bal.net_change
                 if c_bal.trading_volume > 0:
                     call_jpx_vol[td] = c_bal.trading_volume
+                    call_jpx_total += c_bal.trading_volume
 
         ps = start_oi.get(("PUT", strike))  # (long, short) or None
         pe = end_oi.get(("PUT", strike))
@@ -992,6 +996,8 @@ def _aggregate_by_strike(
             call_daily_oi_change=call_doi_chg,
             put_daily_jpx_volume=put_jpx_vol,
             call_daily_jpx_volume=call_jpx_vol,
+            put_week_jpx_total=put_jpx_total,
+            call_week_jpx_total=call_jpx_total,
         ))
 
     return rows
@@ -143,3 +143,5 @@ class OptionStrikeRow:
     # JPX aggregate trading volume per strike (from open_interest.xlsx)
     put_daily_jpx_volume: dict = field(default_factory=dict)  # {date: trading_volume}
     call_daily_jpx_volume: dict = field(default_factory=dict)
+    put_week_jpx_total: int = 0     # sum of put_daily_jpx_volume
+    call_week_jpx_total: int = 0    # sum of call_daily_jpx_volume
@@ -12,7 +12,8 @@ from datetime import date
 from models import OptionStrikeRow, WeekDefinition
 import plotly.graph_objects as go
 
-from utils.gex import calc_gex_profile, calc_gex_surface, get_sq_date
+from ui.session_memo import session_memo
+from utils.gex import calc_gex_profile, calc_gex_surface, find_flip_point, get_sq_date
 
 _DOW_JP = ["月", "火", "水", "木", "金", "土", "日"]
 _OKU = 1e8          # 1億円
@@ -49,9 +50,12 @@ def render_gex_section(
     sigma = iv_pct / 100.0
 
     # --- Extract OI from latest available date ---
-    as_of, put_oi, call_oi, all_strikes = _extract_latest_oi(rows)
+    # Reused across slider/IV reruns while the loaded rows are unchanged
+    as_of, put_oi, call_oi, strikes = session_memo(
+        "gex_oi_cache", (rows,), lambda: _extract_latest_oi(rows),
+    )
 
-    if not all_strikes:
+    if not strikes:
         st.info("建玉データがありません。")
         return
 
@@ -61,7 +65,7 @@ def render_gex_section(
 
     # --- Calculate ---
     profile = calc_gex_profile(
-        strikes=sorted(all_strikes),
+        strikes=strikes,
         put_oi=put_oi,
         call_oi=call_oi,
         spot=float(spot),
@@ -81,7 +85,7 @@ def render_gex_section(
 
     # --- Compute spot-axis flip point (GEX curve zero crossing) ---
     flip_spot = _calc_spot_flip(
-        sorted(all_strikes), put_oi, call_oi,
+        strikes, put_oi, call_oi,
         float(spot), sq, as_of, sigma,
     )
 
@@ -117,7 +121,7 @@ def render_gex_section(
     # --- 3D Surface ---
     st.markdown("---")
     _render_gex_3d_surface(
-        sorted(all_strikes), put_oi, call_oi,
+        strikes, put_oi, call_oi,
         float(spot), sq, as_of, sigma,
     )
 
@@ -132,38 +136,26 @@ def _calc_spot_flip(
     sigma: float,
 ) -> float | None:
     """Find the spot price where total Net GEX crosses zero (nearest to current spot)."""
-    import numpy as np
     spots, _, surface = calc_gex_surface(
         strikes=strikes, put_oi=put_oi, call_oi=call_oi,
         spot_center=spot, spot_range=5000.0, spot_step=50.0,
         expiry_date=sq, as_of=as_of, sigma=sigma,
     )
     total = surface.sum(axis=1)  # net GEX per spot level
-
-    best_flip = None
-    best_dist = float("inf")
-    for i in range(len(total) - 1):
-        if total[i] * total[i + 1] < 0:
-            frac = abs(total[i]) / (abs(total[i]) + abs(total[i + 1]))
-            flip = spots[i] + frac * (spots[i + 1] - spots[i])
-            dist = abs(flip - spot)
-            if dist < best_dist:
-                best_dist = dist
-                best_flip = float(flip)
-    return best_flip
+    return find_flip_point(spots, total, spot)
 
 
 def _extract_latest_oi(
     rows: list[OptionStrikeRow],
-) -> tuple[date, dict[int, int], dict[int, int], set[int]]:
-    """Extract the latest available daily OI across all strikes."""
+) -> tuple[date, dict[int, int], dict[int, int], list[int]]:
+    """Extract the latest available daily OI and the sorted strikes holding it."""
     all_dates: set[date] = set()
     for r in rows:
         all_dates.update(r.put_daily_oi.keys())
         all_dates.update(r.call_daily_oi.keys())
 
     if not all_dates:
-        return date.today(), {}, {}, set()
+        return date.today(), {}, {}, []
 
     latest = max(all_dates)
     put_oi: dict[int, int] = {}
@@ -180,7 +172,7 @@ def _extract_latest_oi(
             if c > 0:
                 call_oi[r.strike_price] = c
 
-    return latest, put_oi, call_oi, all_strikes
+    return latest, put_oi, call_oi, sorted(all_strikes)
 
 
 def _render_gex_bar_chart(df: pd.DataFrame, spot: float) -> None:
@@ -6,11 +6,16 @@ Pandas Styler for PUT/CALL color coding, zebra stripes, column grouping.
 """
 from __future__ import annotations
 
+import re
+
 import numpy as np
 import streamlit as st
 import pandas as pd
 from datetime import date
+from functools import lru_cache
+from typing import NamedTuple
 from models import OptionStrikeRow, WeekDefinition
+from ui.session_memo import session_memo
 
 _DOW_JP = ["月", "火", "水", "木", "金", "土", "日"]
 
@@ -25,6 +30,38 @@ _STRIKE_BG = "#F5F5DC"      # beige for strike price
 _SUMMARY_PUT = "#FFD0D0"    # summary row PUT
 _SUMMARY_CALL = "#C8DEFF"   # summary row CALL
 _SUMMARY_STRIKE = "#E8E8C0" # summary row strike
+# Distinct darker background for broker volume columns to separate them visually
+_PUT_BROKER = "#F5C8C8"       # stronger pink for PUT broker vol
+_PUT_BROKER_ALT = "#EDC0C0"   # zebra alt
+_CALL_BROKER = "#B8D4F0"      # stronger blue for CALL broker vol
+_CALL_BROKER_ALT = "#A8CCE8"  # zebra alt
+_SUMMARY_PUT_BROKER = "#E8A8A8"
+_SUMMARY_CALL_BROKER = "#90B8E0"
+
+# _DayCols field → OptionStrikeRow per-date dict shown in that column
+_DAY_FIELDS = (
+    ("p_day", "put_daily_volumes"),
+    ("p_jpx", "put_daily_jpx_volume"),
+    ("p_oi", "put_daily_oi"),
+    ("p_chg", "put_daily_oi_change"),
+    ("c_day", "call_daily_volumes"),
+    ("c_jpx", "call_daily_jpx_volume"),
+    ("c_oi", "call_daily_oi"),
+    ("c_chg", "call_daily_oi_change"),
+)
+
+# Participant breakdowns up to this length render as a markdown table
+_BREAKDOWN_MARKDOWN_MAX = 12
+
+# Any ASCII punctuation can be backslash-escaped in markdown (covers
+# Streamlit's :emoji:/:color[] and $math$ syntax as well)
+_MD_SPECIAL = re.compile(r"([!-/:-@\[-`{-~])")
+
+# Strikes shown on each side of the most-traded strike before "show all"
+_ATM_WINDOW = 25
+
+_PUT_STATIC_COLS = ("P前週L", "P前週S", "P今週L", "P今週S", "P計")
+_CALL_STATIC_COLS = ("C前週L", "C前週S", "C今週L", "C今週S", "C計")
 
 
 def render_option_strike_table(
@@ -42,36 +79,56 @@ def render_option_strike_table(
         st.warning("オプションデータがありません。")
         return
 
-    # Build DataFrame
-    ordered_cols = _build_column_order(week)
-    df = _build_display_dataframe(rows, week, ordered_cols)
+    _render_table_and_detail(rows, week, tab_label)
 
-    # Column config
-    col_config = _build_column_config(df, week)
-    col_config["_strike_idx"] = None
-
-    # Build column order for display (exclude hidden cols only)
-    display_cols = [c for c in ordered_cols if c != "_strike_idx"]
+    summary = session_memo(
+        f"opt_summary_cache|{tab_label}", (rows,),
+        lambda: _option_summary_totals(rows),
+    )
+    _render_option_summary(*summary)
 
-    # Classify columns for styling
-    put_cols_set, call_cols_set = _classify_columns(week)
-    put_static = {"P前週L", "P前週S", "P今週L", "P今週S", "P計"}
-    call_static = {"C前週L", "C前週S", "C今週L", "C今週S", "C計"}
-    all_put = put_cols_set | put_static
-    all_call = call_cols_set | call_static
 
-    # Identify per-broker volume columns (participant breakdown) for border highlight
-    broker_vol_cols = set()
-    for td in week.trading_days:
-        broker_vol_cols.add(_day_col(td, "P"))
-        broker_vol_cols.add(_day_col(td, "C"))
+@st.fragment
+def _render_table_and_detail(
+    rows: list[OptionStrikeRow],
+    week: WeekDefinition,
+    tab_label: str,
+) -> None:
+    """Table + detail panel, rerun on their own when a cell or widget changes.
 
-    # Apply Pandas Styler
-    styled = _apply_styling(df, all_put, all_call, display_cols, broker_vol_cols)
+    Cell clicks and detail-panel widgets only rerun this fragment, not the
+    whole app script (sidebar, data loading, other tabs).
+    """
+    # Per-date column names, formatted once per week
+    days = _day_columns(tuple(week.trading_days))
 
     # Layout: table (left) | detail (right)
     left_col, right_col = st.columns([3, 1])
 
+    # Long chains open on a window around the most-traded strike (ATM proxy);
+    # the summary row and metrics still cover every strike.
+    window = slice(None)
+    if len(rows) > 2 * _ATM_WINDOW + 1:
+        with left_col:
+            show_all = st.checkbox("全行使価格を表示", key=f"opt_show_all_{tab_label}")
+        if not show_all:
+            size = 2 * _ATM_WINDOW + 1
+            lo = min(max(0, _atm_index(rows) - _ATM_WINDOW), len(rows) - size)
+            window = slice(lo, lo + size)
+
+    # Table and column config depend only on (rows, days, window);
+    # selection-only reruns reuse them and just redraw the detail panel.
+    # The windowed and full views are memoized separately, so flipping
+    # the checkbox back and forth does not rebuild either table.
+    view = "all" if window == slice(None) else "atm"
+    df, styled, truncated, col_config = session_memo(
+        f"opt_table_cache|{tab_label}|{view}", (rows, days, window),
+        lambda: _build_table_view(rows, days, week, window),
+    )
+
+    # Classify per-date columns (used to resolve cell selection)
+    put_cols_set, call_cols_set = _classify_columns(days)
+
     with left_col:
         table_key = f"opt_table_{tab_label}"
         event = st.dataframe(
@@ -83,6 +140,13 @@ def render_option_strike_table(
             key=table_key,
             column_config=col_config,
         )
+        if truncated:
+            st.caption(
+                f"表示セル数の上限により {len(df) - _SUMMARY_ROWS}/{len(rows)} "
+                "行使価格のみ表示"
+            )
+        elif window != slice(None):
+            st.caption(f"ATM周辺 {len(df) - _SUMMARY_ROWS}/{len(rows)} 行使価格を表示")
 
     # Parse cell selection
     selected_strike_idx = None
@@ -104,10 +168,10 @@ def render_option_strike_table(
 
             if col_name in put_cols:
                 selected_type = "PUT"
-                selected_date = _col_to_date(col_name, week)
+                selected_date = _col_to_date(col_name, days)
             elif col_name in call_cols:
                 selected_type = "CALL"
-                selected_date = _col_to_date(col_name, week)
+                selected_date = _col_to_date(col_name, days)
             elif col_name and col_name.startswith("P"):
                 selected_type = "PUT"
             elif col_name and col_name.startswith("C"):
@@ -115,72 +179,130 @@ def render_option_strike_table(
 
     with right_col:
         _render_detail_panel(
-            rows, week,
+            rows, days,
             selected_strike_idx, selected_date, selected_type,
             tab_label,
         )
 
-    _render_option_summary(rows)
-
 
-# =====================================================================
-# Column name helpers
-# =====================================================================
+def _build_table_view(
+    rows: list[OptionStrikeRow],
+    days: tuple[_DayCols, ...],
+    week: WeekDefinition,
+    window: slice = slice(None),
+):
+    """Return (df, Styler, truncated flag, column config)."""
+    df, styled, truncated = _build_styled_table(rows, days, window)
+    col_config = _build_column_config(df, week)
+    col_config["_strike_idx"] = None
+    return df, styled, truncated, col_config
 
-def _day_col(td: date, prefix: str) -> str:
-    dow = _DOW_JP[td.weekday()]
-    return f"{prefix}{td.strftime('%m/%d')}({dow})"
 
+def _build_styled_table(
+    rows: list[OptionStrikeRow],
+    days: tuple[_DayCols, ...],
+    window: slice = slice(None),
+):
+    """Return (display df, Styler, truncated flag) for the option table."""
+    df = _build_display_dataframe(rows, days, _build_column_order(days), window)
 
-def _jpx_vol_col(td: date, prefix: str) -> str:
-    return f"{prefix}出{td.strftime('%d')}"
+    # Streamlit refuses Styler objects above styler.render.max_elements;
+    # trim strike rows up-front so the table always renders.
+    max_cells = pd.get_option("styler.render.max_elements")
+    truncated = df.size > max_cells
+    if truncated:
+        df = df.head(max_cells // len(df.columns))
 
+    return df, _apply_styling(df, _column_styles(days)), truncated
 
-def _oi_col(td: date, prefix: str) -> str:
-    return f"{prefix}建{td.strftime('%d')}"
 
+def _atm_index(rows: list[OptionStrikeRow]) -> int:
+    """Index of the strike with the largest weekly P+C volume."""
+    def _volume(r: OptionStrikeRow) -> int:
+        return (max(r.put_week_jpx_total, r.put_week_total or 0)
+                + max(r.call_week_jpx_total, r.call_week_total or 0))
+    return max(range(len(rows)), key=lambda i: _volume(rows[i]))
 
-def _oi_chg_col(td: date, prefix: str) -> str:
-    return f"{prefix}増{td.strftime('%d')}"
 
+# =====================================================================
+# Column name helpers
+# =====================================================================
 
-def _classify_columns(week: WeekDefinition) -> tuple[set[str], set[str]]:
+class _DayCols(NamedTuple):
+    """Column names for one trading day (P/C × 出来高/JPX出来高/建玉/増減)."""
+    td: date
+    label: str      # "MM/DD(曜)"
+    p_day: str
+    p_jpx: str
+    p_oi: str
+    p_chg: str
+    c_day: str
+    c_jpx: str
+    c_oi: str
+    c_chg: str
+
+
+@lru_cache(maxsize=32)
+def _day_columns(trading_days: tuple[date, ...]) -> tuple[_DayCols, ...]:
+    """Format every per-date column name once for the week."""
+    days = []
+    for td in trading_days:
+        label = f"{td.strftime('%m/%d')}({_DOW_JP[td.weekday()]})"
+        dd = td.strftime("%d")
+        days.append(_DayCols(
+            td, label,
+            f"P{label}", f"P出{dd}", f"P建{dd}", f"P増{dd}",
+            f"C{label}", f"C出{dd}", f"C建{dd}", f"C増{dd}",
+        ))
+    return tuple(days)
+
+
+@lru_cache(maxsize=32)
+def _classify_columns(
+    days: tuple[_DayCols, ...],
+) -> tuple[frozenset[str], frozenset[str]]:
     """Return (put_cols, call_cols) sets for all per-date columns."""
     put_cols = set()
     call_cols = set()
-    for td in week.trading_days:
-        put_cols |= {_day_col(td, "P"), _jpx_vol_col(td, "P"),
-                     _oi_col(td, "P"), _oi_chg_col(td, "P")}
-        call_cols |= {_day_col(td, "C"), _jpx_vol_col(td, "C"),
-                      _oi_col(td, "C"), _oi_chg_col(td, "C")}
-    return put_cols, call_cols
+    for d in days:
+        put_cols |= {d.p_day, d.p_jpx, d.p_oi, d.p_chg}
+        call_cols |= {d.c_day, d.c_jpx, d.c_oi, d.c_chg}
+    return frozenset(put_cols), frozenset(call_cols)
+
+
+@lru_cache(maxsize=32)
+def _date_labels(days: tuple[_DayCols, ...]) -> dict[date, str]:
+    """Map each trading day to its "MM/DD(曜)" label."""
+    return {d.td: d.label for d in days}
 
 
-def _col_to_date(col_name: str, week: WeekDefinition) -> date | None:
+def _col_to_date(col_name: str, days: tuple[_DayCols, ...]) -> date | None:
     """Resolve any per-date column name to a date."""
-    for td in week.trading_days:
-        for prefix in ("P", "C"):
-            if col_name in (_day_col(td, prefix), _jpx_vol_col(td, prefix),
-                            _oi_col(td, prefix), _oi_chg_col(td, prefix)):
-                return td
-    return None
+    return _col_dates(days).get(col_name)
+
+
+@lru_cache(maxsize=32)
+def _col_dates(days: tuple[_DayCols, ...]) -> dict[str, date]:
+    """Reverse map of every per-date column name to its trading day."""
+    return {col: d.td for d in days for col in d[2:]}
 
 
 # =====================================================================
 # Column order
 # =====================================================================
 
-def _build_column_order(week: WeekDefinition) -> list[str]:
+@lru_cache(maxsize=32)
+def _build_column_order(days: tuple[_DayCols, ...]) -> tuple[str, ...]:
     """PUT side | 行使価格 | CALL side."""
     cols = []
 
     cols.append("P前週L")
     cols.append("P前週S")
-    for td in week.trading_days:
-        cols.append(_day_col(td, "P"))
-        cols.append(_jpx_vol_col(td, "P"))
-        cols.append(_oi_col(td, "P"))
-        cols.append(_oi_chg_col(td, "P"))
+    for d in days:
+        cols.append(d.p_day)
+        cols.append(d.p_jpx)
+        cols.append(d.p_oi)
+        cols.append(d.p_chg)
     cols.append("P計")
     cols.append("P今週L")
     cols.append("P今週S")
@@ -190,15 +312,15 @@ def _build_column_order(week: WeekDefinition) -> list[str]:
     cols.append("C今週L")
     cols.append("C今週S")
     cols.append("C計")
-    for td in reversed(week.trading_days):
-        cols.append(_oi_chg_col(td, "C"))
-        cols.append(_oi_col(td, "C"))
-        cols.append(_jpx_vol_col(td, "C"))
-        cols.append(_day_col(td, "C"))
+    for d in reversed(days):
+        cols.append(d.c_chg)
+        cols.append(d.c_oi)
+        cols.append(d.c_jpx)
+        cols.append(d.c_day)
     cols.append("C前週L")
     cols.append("C前週S")
 
-    return cols
+    return tuple(cols)
 
 
 # =====================================================================
@@ -220,76 +342,59 @@ def _build_column_config(df: pd.DataFrame, week: WeekDefinition) -> dict:
 # Styling
 # =====================================================================
 
+@lru_cache(maxsize=32)
+def _column_styles(days: tuple[_DayCols, ...]) -> dict[str, tuple[str, str, str]]:
+    """Map each styled column to its (normal, zebra, summary) CSS.
+
+    Every column belongs to exactly one category (PUT/CALL, broker volume
+    or not, strike), so styling needs a single dict lookup per column.
+    """
+    def _triple(bg: str, bg_alt: str, bg_summary: str) -> tuple[str, str, str]:
+        return (
+            f"background-color: {bg}",
+            f"background-color: {bg_alt}",
+            f"background-color: {bg_summary}; font-weight: bold",
+        )
+
+    put = _triple(_PUT_BG, _PUT_BG_ALT, _SUMMARY_PUT)
+    call = _triple(_CALL_BG, _CALL_BG_ALT, _SUMMARY_CALL)
+    put_broker = _triple(_PUT_BROKER, _PUT_BROKER_ALT, _SUMMARY_PUT_BROKER)
+    call_broker = _triple(_CALL_BROKER, _CALL_BROKER_ALT, _SUMMARY_CALL_BROKER)
+    strike = f"background-color: {_STRIKE_BG}; font-weight: bold"
+
+    styles = {"行使価格": (strike, strike, f"background-color: {_SUMMARY_STRIKE}; font-weight: bold")}
+    styles.update(dict.fromkeys(_PUT_STATIC_COLS, put))
+    styles.update(dict.fromkeys(_CALL_STATIC_COLS, call))
+    for d in days:
+        styles.update(dict.fromkeys((d.p_jpx, d.p_oi, d.p_chg), put))
+        styles.update(dict.fromkeys((d.c_jpx, d.c_oi, d.c_chg), call))
+        styles[d.p_day] = put_broker
+        styles[d.c_day] = call_broker
+    return styles
+
+
 def _apply_styling(
     df: pd.DataFrame,
-    put_cols: set[str],
-    call_cols: set[str],
-    display_cols: list[str],
-    broker_vol_cols: set[str] | None = None,
+    col_styles: dict[str, tuple[str, str, str]],
 ) -> pd.io.formats.style.Styler:
     """Apply Pandas Styler for PUT/CALL color coding, zebra stripes, and broker vol emphasis."""
 
-    _broker_cols = broker_vol_cols or set()
-
-    # Distinct darker background for broker volume columns to separate them visually
-    _PUT_BROKER = "#F5C8C8"       # stronger pink for PUT broker vol
-    _PUT_BROKER_ALT = "#EDC0C0"   # zebra alt
-    _CALL_BROKER = "#B8D4F0"      # stronger blue for CALL broker vol
-    _CALL_BROKER_ALT = "#A8CCE8"  # zebra alt
-    _SUMMARY_PUT_BROKER = "#E8A8A8"
-    _SUMMARY_CALL_BROKER = "#90B8E0"
-
-    styler = df.style
-
-    # Build background-color map per cell
-    def _color_cells(row):
-        row_idx = row.name  # positional index
-        is_summary = row_idx < _SUMMARY_ROWS
-        is_odd_data = (row_idx - _SUMMARY_ROWS) % 2 == 1  # zebra for data rows
-
-        styles = []
-        for col in row.index:
-            if col == "_strike_idx":
-                styles.append("")
-                continue
-
-            if col == "行使価格":
-                bg = _SUMMARY_STRIKE if is_summary else _STRIKE_BG
-                styles.append(f"background-color: {bg}; font-weight: bold")
-                continue
-
-            is_broker = col in _broker_cols
-
-            if col in put_cols:
-                if is_summary:
-                    bg = _SUMMARY_PUT_BROKER if is_broker else _SUMMARY_PUT
-                elif is_broker:
-                    bg = _PUT_BROKER_ALT if is_odd_data else _PUT_BROKER
-                else:
-                    bg = _PUT_BG_ALT if is_odd_data else _PUT_BG
-                styles.append(f"background-color: {bg}")
-            elif col in call_cols:
-                if is_summary:
-                    bg = _SUMMARY_CALL_BROKER if is_broker else _SUMMARY_CALL
-                elif is_broker:
-                    bg = _CALL_BROKER_ALT if is_odd_data else _CALL_BROKER
-                else:
-                    bg = _CALL_BG_ALT if is_odd_data else _CALL_BG
-                styles.append(f"background-color: {bg}")
-            else:
-                styles.append("")
-
-        return styles
-
-    styler = styler.apply(_color_cells, axis=1)
-
-    # Bold for summary row
-    def _bold_summary(row):
-        if row.name < _SUMMARY_ROWS:
-            return ["font-weight: bold"] * len(row)
-        return [""] * len(row)
-
-    styler = styler.apply(_bold_summary, axis=1)
+    # Cell style depends only on the column and on the row kind (summary /
+    # even data / odd data), so broadcast the per-column style triples into
+    # a full style matrix applied in a single pass.
+    unstyled = ("", "", "font-weight: bold")
+    normal, zebra, summary = zip(*(col_styles.get(c, unstyled) for c in df.columns))
+
+    is_odd_data = (np.arange(len(df)) - _SUMMARY_ROWS) % 2 == 1
+    styles = np.where(
+        is_odd_data[:, None],
+        np.array(zebra, dtype=object)[None, :],
+        np.array(normal, dtype=object)[None, :],
+    )
+    styles[:_SUMMARY_ROWS] = np.array(summary, dtype=object)
+    style_df = pd.DataFrame(styles, index=df.index, columns=df.columns)
+
+    styler = df.style.apply(lambda _: style_df, axis=None)
 
     # Hide internal metadata column
     styler = styler.hide(subset=["_strike_idx"], axis="columns")
@@ -303,112 +408,92 @@ def _apply_styling(
 
 def _build_display_dataframe(
     rows: list[OptionStrikeRow],
-    week: WeekDefinition,
-    ordered_cols: list[str],
+    days: tuple[_DayCols, ...],
+    ordered_cols: tuple[str, ...],
+    window: slice = slice(None),
 ) -> pd.DataFrame:
-    """Build DataFrame with summary row + one row per strike.
+    """Build DataFrame with summary row + one row per strike in window.
 
-    Row 0: 合計, Row 1+: individual strikes.
-    Data kept as numeric (float) — formatting is handled by Styler.
+    Row 0: 合計 (all strikes), Row 1+: individual strikes.
+    Numeric cells are pre-formatted strings; Styler adds color only.
     """
-    summary_rows = _build_summary_rows(rows, week)
-    records = []
-    for idx, row in enumerate(rows):
-        rec = _build_volume_row(row, week)
-        rec["_strike_idx"] = idx
-        records.append(rec)
-
-    all_cols = ordered_cols + ["_strike_idx"]
-    df = pd.DataFrame(summary_rows + records, columns=all_cols)
-
-    # Convert numeric columns to formatted strings (integer + comma).
-    # NaN → empty string. Styler handles color only; formatting done here
-    # because Streamlit ignores Styler.format() for display values.
-    num_cols = [c for c in df.columns if c not in ("行使価格", "_strike_idx")]
-    for c in num_cols:
-        series = pd.to_numeric(df[c], errors="coerce")
-        df[c] = series.apply(
-            lambda v: f"{int(v):,}" if pd.notna(v) else ""
-        )
-
-    return df
-
-
-def _build_summary_rows(rows, week):
+    strike_cols = _build_volume_columns(rows, days)
+    summary_rows = _build_summary_rows(strike_cols, days)
+    strike_cols["_strike_idx"] = list(range(len(rows)))
+    if window != slice(None):
+        strike_cols = {c: values[window] for c, values in strike_cols.items()}
+
+    # Column-wise construction: summary values first, then one list per column.
+    # Numeric cells are formatted to strings (integer + comma, missing → "")
+    # while building, because Streamlit ignores Styler.format() for display
+    # values; Styler handles color only.
+    all_cols = [*ordered_cols, "_strike_idx"]
+    data = {}
+    for c in all_cols:
+        values = [rec.get(c) for rec in summary_rows] + strike_cols[c]
+        if c not in ("行使価格", "_strike_idx"):
+            values = [f"{int(v):,}" if v is not None and v == v else "" for v in values]
+        data[c] = values
+
+    return pd.DataFrame(data, columns=all_cols)
+
+
+def _build_summary_rows(strike_cols, days):
+    """Summary record from the per-strike column lists (None counts as 0)."""
     rec = {"行使価格": "合計", "_strike_idx": None}
 
     for col in ("P前週L", "P前週S", "P今週L", "P今週S",
                 "C前週L", "C前週S", "C今週L", "C今週S"):
         rec[col] = None
 
-    put_total = 0.0
-    call_total = 0.0
-    put_jpx_total = 0.0
-    call_jpx_total = 0.0
-
-    for td in week.trading_days:
-        p_vol = sum(r.put_daily_volumes.get(td, 0) for r in rows)
-        c_vol = sum(r.call_daily_volumes.get(td, 0) for r in rows)
-        p_jpx = sum(r.put_daily_jpx_volume.get(td, 0) for r in rows)
-        c_jpx = sum(r.call_daily_jpx_volume.get(td, 0) for r in rows)
-        p_oi = sum(r.put_daily_oi.get(td, 0) for r in rows)
-        c_oi = sum(r.call_daily_oi.get(td, 0) for r in rows)
-        p_chg = sum(r.put_daily_oi_change.get(td, 0) for r in rows)
-        c_chg = sum(r.call_daily_oi_change.get(td, 0) for r in rows)
-
-        rec[_day_col(td, "P")] = p_vol or None
-        rec[_jpx_vol_col(td, "P")] = p_jpx or None
-        rec[_oi_col(td, "P")] = p_oi or None
-        rec[_oi_chg_col(td, "P")] = p_chg or None
-
-        rec[_day_col(td, "C")] = c_vol or None
-        rec[_jpx_vol_col(td, "C")] = c_jpx or None
-        rec[_oi_col(td, "C")] = c_oi or None
-        rec[_oi_chg_col(td, "C")] = c_chg or None
-
-        put_total += p_vol
-        call_total += c_vol
-        put_jpx_total += p_jpx
-        call_jpx_total += c_jpx
+    # One (day columns × strikes) matrix, reduced in a single nansum
+    # A week without trading days has no day columns to reduce
+    day_cols = [c for d in days for c in d[2:]]
+    col_total = {}
+    if day_cols:
+        totals = np.nansum(
+            np.array([strike_cols[c] for c in day_cols], dtype=float), axis=1,
+        )
+        col_total = dict(zip(day_cols, totals))
+    rec.update((c, t or None) for c, t in col_total.items())
 
     # Use JPX volumes when participant volumes are incomplete (e.g. forward months)
-    rec["P計"] = max(put_total, put_jpx_total) or None
-    rec["C計"] = max(call_total, call_jpx_total) or None
+    rec["P計"] = max(
+        sum(col_total[d.p_day] for d in days),
+        sum(col_total[d.p_jpx] for d in days),
+    ) or None
+    rec["C計"] = max(
+        sum(col_total[d.c_day] for d in days),
+        sum(col_total[d.c_jpx] for d in days),
+    ) or None
 
     return [rec]
 
 
-def _build_volume_row(row, week):
-    rec = {}
-    rec["P前週L"] = row.put_start_oi_long
-    rec["P前週S"] = row.put_start_oi_short
+def _build_volume_columns(rows, days):
+    """Per-strike display values keyed by column name (one list per column)."""
+    cols = {
+        "P前週L": [r.put_start_oi_long for r in rows],
+        "P前週S": [r.put_start_oi_short for r in rows],
+        "P計": [r.put_week_total for r in rows],
+        "P今週L": [r.put_end_oi_long for r in rows],
+        "P今週S": [r.put_end_oi_short for r in rows],
+        "行使価格": [f"{r.strike_price:,}" for r in rows],
+        "C今週L": [r.call_end_oi_long for r in rows],
+        "C今週S": [r.call_end_oi_short for r in rows],
+        "C計": [r.call_week_total for r in rows],
+        "C前週L": [r.call_start_oi_long for r in rows],
+        "C前週S": [r.call_start_oi_short for r in rows],
+    }
+
+    # Bind each row's dict .get once per field, not once per (field, day)
+    for field, attr in _DAY_FIELDS:
+        getters = [getattr(r, attr).get for r in rows]
+        for d in days:
+            td = d.td
+            cols[getattr(d, field)] = [get(td) or None for get in getters]
 
-    for td in week.trading_days:
-        rec[_day_col(td, "P")] = row.put_daily_volumes.get(td) or None
-        rec[_jpx_vol_col(td, "P")] = row.put_daily_jpx_volume.get(td) or None
-        rec[_oi_col(td, "P")] = row.put_daily_oi.get(td) or None
-        rec[_oi_chg_col(td, "P")] = row.put_daily_oi_change.get(td) or None
-
-    rec["P計"] = row.put_week_total
-    rec["P今週L"] = row.put_end_oi_long
-    rec["P今週S"] = row.put_end_oi_short
-
-    rec["行使価格"] = f"{row.strike_price:,}"
-
-    rec["C今週L"] = row.call_end_oi_long
-    rec["C今週S"] = row.call_end_oi_short
-    rec["C計"] = row.call_week_total
-
-    for td in reversed(week.trading_days):
-        rec[_oi_chg_col(td, "C")] = row.call_daily_oi_change.get(td) or None
-        rec[_oi_col(td, "C")] = row.call_daily_oi.get(td) or None
-        rec[_jpx_vol_col(td, "C")] = row.call_daily_jpx_volume.get(td) or None
-        rec[_day_col(td, "C")] = row.call_daily_volumes.get(td) or None
-
-    rec["C前週L"] = row.call_start_oi_long
-    rec["C前週S"] = row.call_start_oi_short
-
-    return rec
+    return cols
 
 
 # =====================================================================
@@ -417,7 +502,7 @@ def _build_volume_row(row, week):
 
 def _render_detail_panel(
     rows: list[OptionStrikeRow],
-    week: WeekDefinition,
+    days: tuple[_DayCols, ...],
     strike_idx: int | None,
     selected_date: date | None,
     selected_type: str | None,
@@ -435,16 +520,17 @@ def _render_detail_panel(
         selected_type = "CALL"
 
     if selected_date is None:
-        day_labels = [f"{td.strftime('%m/%d')}({_DOW_JP[td.weekday()]})"
-                      for td in week.trading_days]
         prefix = f"bd_{tab_label}"
-        day_choice = st.selectbox("日付", day_labels, key=f"{prefix}_day_r")
+        day_choice = st.selectbox(
+            "日付", days, format_func=lambda d: d.label, key=f"{prefix}_day_r",
+        )
         if day_choice is None:
             return
-        selected_date = week.trading_days[day_labels.index(day_choice)]
+        selected_date = day_choice.td
 
-    dow = _DOW_JP[selected_date.weekday()]
-    date_str = f"{selected_date.strftime('%m/%d')}({dow})"
+    date_str = _date_labels(days).get(selected_date) or (
+        f"{selected_date.strftime('%m/%d')}({_DOW_JP[selected_date.weekday()]})"
+    )
 
     _render_participant_breakdown(target_row, selected_type, selected_date, date_str)
     _render_oi_detail(target_row, selected_type, selected_date)
@@ -465,15 +551,35 @@ def _render_participant_breakdown(row, option_type, td, date_str):
     st.markdown(f"**{header}**")
     st.markdown(f"出来高: **{int(total):,}**枚")
 
-    bd_df = pd.DataFrame(breakdown, columns=["参加者", "枚数"])
-    bd_df["枚数"] = bd_df["枚数"].astype(int)
-    bd_df["構成比"] = (bd_df["枚数"] / total * 100).round(1).astype(str) + "%"
-    st.dataframe(
-        bd_df,
-        use_container_width=True,
-        hide_index=True,
-        height=min(len(breakdown) * 35 + 40, 500),
-    )
+    scale = 100 / total if total else 0
+
+    # Long lists keep the scrollable dataframe widget; the usual handful of
+    # participants renders as a markdown table, far lighter than mounting
+    # another dataframe.
+    if len(breakdown) > _BREAKDOWN_MARKDOWN_MAX:
+        st.dataframe(
+            pd.DataFrame({
+                "参加者": [name for name, _ in breakdown],
+                "枚数": [int(v) for _, v in breakdown],
+                "構成比": [f"{v * scale:.1f}%" for _, v in breakdown],
+            }),
+            use_container_width=True,
+            hide_index=True,
+            height=min(len(breakdown) * 35 + 40, 500),
+        )
+        return
+
+    lines = ["| 参加者 | 枚数 | 構成比 |", "|:--|--:|--:|"]
+    lines += [
+        f"| {_md_escape(name)} | {int(v):,} | {v * scale:.1f}% |"
+        for name, v in breakdown
+    ]
+    st.markdown("\n".join(lines))
+
+
+def _md_escape(text) -> str:
+    """Escape a value for literal display inside a markdown table cell."""
+    return _MD_SPECIAL.sub(r"\\\1", " ".join(str(text).split()))
 
 
 def _render_oi_detail(row, option_type, td):
@@ -497,28 +603,35 @@ def _render_oi_detail(row, option_type, td):
         st.caption(f"JPX出来高: {jpx_vol:,}")
 
 
-def _render_option_summary(rows: list[OptionStrikeRow]) -> None:
-    st.markdown("---")
-    cols = st.columns(4)
-
+def _option_summary_totals(
+    rows: list[OptionStrikeRow],
+) -> tuple[int, int, float, int]:
+    """Return (put volume, call volume, P/C ratio, active strike count)."""
     # Use JPX volumes (from daily OI balance) as primary source;
     # fallback to participant volumes when JPX data unavailable
     total_put_vol = 0
     total_call_vol = 0
     active_strikes = 0
     for r in rows:
-        p_jpx = sum(r.put_daily_jpx_volume.values())
-        c_jpx = sum(r.call_daily_jpx_volume.values())
-        p_part = r.put_week_total or 0
-        c_part = r.call_week_total or 0
-        p_vol = max(p_jpx, p_part)
-        c_vol = max(c_jpx, c_part)
+        p_vol = max(r.put_week_jpx_total, r.put_week_total or 0)
+        c_vol = max(r.call_week_jpx_total, r.call_week_total or 0)
         total_put_vol += p_vol
         total_call_vol += c_vol
         if p_vol > 0 or c_vol > 0:
             active_strikes += 1
 
     pcr = total_put_vol / total_call_vol if total_call_vol > 0 else 0
+    return total_put_vol, total_call_vol, pcr, active_strikes
+
+
+def _render_option_summary(
+    total_put_vol: int,
+    total_call_vol: int,
+    pcr: float,
+    active_strikes: int,
+) -> None:
+    st.markdown("---")
+    cols = st.columns(4)
 
     with cols[0]:
         st.metric("PUT出来高計", f"{int(total_put_vol):,}")
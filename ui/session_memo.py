@@ -0,0 +1,18 @@
+"""Session-scoped memoization shared by the UI components."""
+from __future__ import annotations
+
+import streamlit as st
+
+
+def session_memo(key: str, deps: tuple, build):
+    """Return build() cached in session_state until any dep changes.
+
+    Deps are compared by identity first, then equality.
+    """
+    entry = st.session_state.get(key)
+    if entry is None or len(entry[0]) != len(deps) or not all(
+        a is b or a == b for a, b in zip(entry[0], deps)
+    ):
+        entry = (deps, build())
+        st.session_state[key] = entry
+    return entry[1]
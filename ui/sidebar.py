@@ -2,15 +2,50 @@
 from __future__ import annotations
 
 import streamlit as st
+from datetime import date
 from data.aggregator import (
     build_available_weeks,
     get_available_contract_months,
     get_available_option_contract_months,
     get_option_participants,
 )
+from models import WeekDefinition
 import config
 
 
+# =====================================================================
+# Cached lookups — the sidebar runs on every rerun, its inputs rarely change.
+# A week is keyed by its OI dates and trading days (an in-progress week
+# gains days while its end date stays None); the object is passed unhashed.
+# =====================================================================
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _available_weeks(max_weeks: int) -> list[WeekDefinition]:
+    return build_available_weeks(max_weeks=max_weeks)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _contract_months(
+    start: date, end: date, days: tuple[date, ...], product: str, _week: WeekDefinition,
+) -> list[str]:
+    return get_available_contract_months(_week, product)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _option_contract_months(
+    start: date, end: date, days: tuple[date, ...], _week: WeekDefinition,
+) -> list[str]:
+    return get_available_option_contract_months(_week)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _option_participants(
+    start: date, end: date, days: tuple[date, ...], contract_month: str,
+    _week: WeekDefinition,
+) -> list[tuple[str, str]]:
+    return get_option_participants(_week, contract_month)
+
+
 def _format_contract_month(cm: str) -> str:
     if not cm:
         return "-"
@@ -33,7 +68,7 @@ def render_sidebar() -> dict:
     )
 
     # Week selector
-    weeks = build_available_weeks(max_weeks=26)
+    weeks = _available_weeks(26)
     if not weeks:
         st.sidebar.error("データが見つかりません")
         st.stop()
@@ -45,7 +80,10 @@ def render_sidebar() -> dict:
     )
 
     # Futures contract month selector
-    contract_months = get_available_contract_months(week, product)
+    days = tuple(week.trading_days)
+    contract_months = _contract_months(
+        week.start_oi_date, week.end_oi_date, days, product, week,
+    )
     if not contract_months or contract_months == [""]:
         st.sidebar.warning("限月データなし")
         st.stop()
@@ -61,7 +99,9 @@ def render_sidebar() -> dict:
     st.sidebar.subheader("オプション設定")
 
     # Option contract month
-    opt_months = get_available_option_contract_months(week)
+    opt_months = _option_contract_months(
+        week.start_oi_date, week.end_oi_date, days, week,
+    )
     option_contract_month = ""
     if opt_months:
         option_contract_month = st.sidebar.selectbox(
@@ -72,34 +112,56 @@ def render_sidebar() -> dict:
     else:
         st.sidebar.info("オプション限月データなし")
 
-    # Option participant filter (individual checkboxes)
+    # Option participant filter (one multiselect instead of N checkboxes)
     option_participant_ids = None  # None = all participants
     if option_contract_month:
-        participants = get_option_participants(week, option_contract_month)
+        participants = _option_participants(
+            week.start_oi_date, week.end_oi_date, days, option_contract_month, week,
+        )
         if participants:
+            all_pids = [pid for pid, _ in participants]
+            names = dict(participants)
+
+            # Only explicit deselections are remembered, so a participant
+            # missing from one week/month is selected again when it returns.
+            # The widget value is re-derived only when the list changes (or
+            # its state was dropped); otherwise the widget's state is current.
+            # State is only written when the value actually changes.
+            excluded = st.session_state.get("opt_pids_excluded", frozenset())
+            if (
+                "opt_pids" not in st.session_state
+                or all_pids != st.session_state.get("opt_pids_options")
+            ):
+                derived = [pid for pid in all_pids if pid not in excluded]
+                if derived != st.session_state.get("opt_pids"):
+                    st.session_state["opt_pids"] = derived
+
             with st.sidebar.expander("参加者フィルター", expanded=False):
                 # Select all / Deselect all buttons
                 btn_col1, btn_col2 = st.columns(2)
                 with btn_col1:
                     if st.button("全選択", key="opt_sel_all"):
-                        for pid, _ in participants:
-                            st.session_state[f"opt_pid_{pid}"] = True
+                        st.session_state["opt_pids"] = all_pids
                 with btn_col2:
                     if st.button("全解除", key="opt_desel_all"):
-                        for pid, _ in participants:
-                            st.session_state[f"opt_pid_{pid}"] = False
-
-                # Individual checkboxes
-                selected_pids = []
-                for pid, name in participants:
-                    key = f"opt_pid_{pid}"
-                    if key not in st.session_state:
-                        st.session_state[key] = True
-                    checked = st.checkbox(name, key=key)
-                    if checked:
-                        selected_pids.append(pid)
-
-                # Return None (all) if everyone is checked, else the list
+                        st.session_state["opt_pids"] = []
+
+                selected_pids = st.multiselect(
+                    "参加者",
+                    all_pids,
+                    format_func=lambda pid: names.get(pid, pid),
+                    key="opt_pids",
+                )
+
+                # Fold this list's deselections into the remembered set,
+                # minus anything re-selected
+                new_excluded = frozenset((excluded | set(all_pids)) - set(selected_pids))
+                if new_excluded != excluded:
+                    st.session_state["opt_pids_excluded"] = new_excluded
+                if all_pids != st.session_state.get("opt_pids_options"):
+                    st.session_state["opt_pids_options"] = all_pids
+
+                # Return None (all) if everyone is selected, else the list
                 if len(selected_pids) == len(participants):
                     option_participant_ids = None
                 elif selected_pids:
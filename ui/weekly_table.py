@@ -1,9 +1,14 @@
 """Main weekly table visualization component."""
 from __future__ import annotations
 
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 from models import WeeklyParticipantRow, WeekDefinition, DailyFuturesOI
+from ui.session_memo import session_memo
 import config
 
 
@@ -40,14 +45,18 @@ def render_weekly_table(
         st.warning("選択された条件のデータがありません。")
         return
 
-    df = _build_display_dataframe(rows, week, show_oi, stats_20d, daily_futures_oi)
-
     # Determine OI header row count (for styling exclusion)
     oi_header_rows = 0
     if daily_futures_oi:
         oi_header_rows = 2  # row 0 = 建玉残高, row 1 = 前日比
 
-    styled = _apply_table_styling(df, week, show_oi, oi_header_rows)
+    # Frame and Styler are rebuilt only when the inputs change,
+    # not on every unrelated rerun
+    df, styled, weekly_totals = session_memo(
+        f"weekly_df|{tab_label}",
+        (rows, tuple(week.trading_days), show_oi, stats_20d, daily_futures_oi),
+        lambda: _build_styled_table(rows, week, show_oi, stats_20d, daily_futures_oi, oi_header_rows),
+    )
 
     st.dataframe(
         styled,
@@ -56,7 +65,26 @@ def render_weekly_table(
     )
 
     if show_oi:
-        _render_summary_stats(rows)
+        _render_summary_stats(rows, weekly_totals)
+
+
+def _build_styled_table(
+    rows: list[WeeklyParticipantRow],
+    week: WeekDefinition,
+    show_oi: bool,
+    stats_20d: dict | None,
+    daily_futures_oi: dict | None,
+    oi_header_rows: int,
+):
+    """Return (df, styled, per-participant weekly totals) for the weekly table."""
+    df, weekly_totals = _build_display_dataframe(rows, week, show_oi, stats_20d, daily_futures_oi)
+    return df, _apply_table_styling(df, week, show_oi, oi_header_rows), weekly_totals
+
+
+@lru_cache(maxsize=32)
+def _day_col_names(trading_days: tuple[date, ...]) -> tuple[str, ...]:
+    """Format the "MM/DD(曜)" day column names once per week."""
+    return tuple(f"{td.strftime('%m/%d')}({_DOW_JP[td.weekday()]})" for td in trading_days)
 
 
 def _build_display_dataframe(
@@ -65,102 +93,76 @@ def _build_display_dataframe(
     show_oi: bool,
     stats_20d: dict | None = None,
     daily_futures_oi: dict | None = None,
-) -> pd.DataFrame:
-    """Build the display DataFrame.
+) -> tuple[pd.DataFrame, list[float]]:
+    """Build the display DataFrame and the per-participant weekly totals.
 
     If daily_futures_oi is provided, row 0 = 建玉残高, row 1 = 前日比,
     then participant rows follow from row 2 onward.
     """
-    day_col_names = []
-    for td in week.trading_days:
-        dow = _DOW_JP[td.weekday()]
-        day_col_names.append(f"{td.strftime('%m/%d')}({dow})")
+    day_col_names = _day_col_names(tuple(week.trading_days))
+
+    # Column-wise construction: one list per column, in display order
+    oi_cols = ["前週L", "前週S"] if show_oi else []
+    tail_cols = ["今週L", "今週S", "増減", "推定買", "推定売", "方向"] if show_oi else []
+    col_names = ["参加者", *oi_cols, *day_col_names, "週間計", "20日平均", "20日最大", *tail_cols]
+    cols: dict[str, list] = {c: [] for c in col_names}
 
     # --- OI header rows ---
-    oi_rows = []
     if daily_futures_oi:
-        # Row 0: 建玉残高
-        rec_oi = {"参加者": "建玉残高"}
-        if show_oi:
-            rec_oi["前週L"] = None
-            rec_oi["前週S"] = None
-        for td, col_name in zip(week.trading_days, day_col_names):
-            oi_rec = daily_futures_oi.get(td)
-            rec_oi[col_name] = oi_rec.current_oi if oi_rec else None
-        rec_oi["週間計"] = None
-        rec_oi["20日平均"] = None
-        rec_oi["20日最大"] = None
-        if show_oi:
-            rec_oi["今週L"] = None
-            rec_oi["今週S"] = None
-            rec_oi["増減"] = None
-            rec_oi["推定買"] = None
-            rec_oi["推定売"] = None
-            rec_oi["方向"] = ""
-        oi_rows.append(rec_oi)
-
-        # Row 1: 前日比
-        rec_chg = {"参加者": "前日比"}
-        if show_oi:
-            rec_chg["前週L"] = None
-            rec_chg["前週S"] = None
-        for td, col_name in zip(week.trading_days, day_col_names):
-            oi_rec = daily_futures_oi.get(td)
-            rec_chg[col_name] = oi_rec.net_change if oi_rec else None
-        rec_chg["週間計"] = None
-        rec_chg["20日平均"] = None
-        rec_chg["20日最大"] = None
-        if show_oi:
-            rec_chg["今週L"] = None
-            rec_chg["今週S"] = None
-            rec_chg["増減"] = None
-            rec_chg["推定買"] = None
-            rec_chg["推定売"] = None
-            rec_chg["方向"] = ""
-        oi_rows.append(rec_chg)
+        # Row 0: 建玉残高, Row 1: 前日比 — only the day columns carry values
+        oi_recs = [daily_futures_oi.get(td) for td in week.trading_days]
+        for label, attr in (("建玉残高", "current_oi"), ("前日比", "net_change")):
+            head = {"参加者": label, "方向": ""}
+            for col_name, oi_rec in zip(day_col_names, oi_recs):
+                head[col_name] = getattr(oi_rec, attr) if oi_rec else None
+            for c in col_names:
+                cols[c].append(head.get(c))
 
     # --- Participant rows ---
-    records = []
-    for row in rows:
-        rec = {"参加者": row.participant_name}
-
-        if show_oi:
-            rec["前週L"] = row.start_oi_long
-            rec["前週S"] = row.start_oi_short
+    # Daily volumes as one (participants x days) array; missing days are 0
+    trading_days = week.trading_days
+    vols = np.array(
+        [[row.daily_volumes.get(td, 0) for td in trading_days] for row in rows],
+        dtype=float,
+    ).reshape(len(rows), len(trading_days))
+    weekly_totals = vols.sum(axis=1)
+
+    for j, col_name in enumerate(day_col_names):
+        cols[col_name].extend(np.where(vols[:, j] != 0, vols[:, j], np.nan).tolist())
+    cols["週間計"].extend(np.where(weekly_totals > 0, weekly_totals, np.nan).tolist())
+
+    append_name = cols["参加者"].append
+    append_avg = cols["20日平均"].append
+    append_max = cols["20日最大"].append
+    stats_get = stats_20d.get if stats_20d else None
 
-        weekly_total = 0.0
-        for td, col_name in zip(week.trading_days, day_col_names):
-            vol = row.daily_volumes.get(td)
-            rec[col_name] = vol if vol else None
-            if vol:
-                weekly_total += vol
-
-        rec["週間計"] = weekly_total if weekly_total > 0 else None
+    for row in rows:
+        append_name(row.participant_name)
 
-        avg_20d = None
-        max_20d = None
-        if stats_20d and row.participant_id in stats_20d:
-            avg_20d, max_20d = stats_20d[row.participant_id]
-        rec["20日平均"] = round(avg_20d) if avg_20d is not None else None
-        rec["20日最大"] = round(max_20d) if max_20d is not None else None
+        stats = stats_get(row.participant_id) if stats_get else None
+        avg_20d, max_20d = stats if stats is not None else (None, None)
+        append_avg(round(avg_20d) if avg_20d is not None else None)
+        append_max(round(max_20d) if max_20d is not None else None)
 
         if show_oi:
-            rec["今週L"] = row.end_oi_long
-            rec["今週S"] = row.end_oi_short
-            rec["増減"] = row.oi_net_change
-
-            est_buy = None
-            est_sell = None
-            if row.oi_net_change is not None and weekly_total > 0:
-                est_buy = (weekly_total + row.oi_net_change) / 2
-                est_sell = (weekly_total - row.oi_net_change) / 2
-            rec["推定買"] = est_buy
-            rec["推定売"] = est_sell
-            rec["方向"] = _direction_label(row.inferred_direction)
+            cols["前週L"].append(row.start_oi_long)
+            cols["前週S"].append(row.start_oi_short)
+            cols["今週L"].append(row.end_oi_long)
+            cols["今週S"].append(row.end_oi_short)
+            cols["増減"].append(row.oi_net_change)
+            cols["方向"].append(_direction_label(row.inferred_direction))
 
-        records.append(rec)
+    if show_oi:
+        # Estimated buy/sell need both a published net change and some volume
+        oi_net = np.array(
+            [np.nan if r.oi_net_change is None else r.oi_net_change for r in rows],
+            dtype=float,
+        )
+        no_est = np.isnan(oi_net) | (weekly_totals <= 0)
+        cols["推定買"].extend(np.where(no_est, np.nan, (weekly_totals + oi_net) / 2).tolist())
+        cols["推定売"].extend(np.where(no_est, np.nan, (weekly_totals - oi_net) / 2).tolist())
 
-    return pd.DataFrame(oi_rows + records)
+    return pd.DataFrame(cols, columns=col_names), weekly_totals.tolist()
 
 
 def _apply_table_styling(
@@ -168,7 +170,7 @@ def _apply_table_styling(
     oi_header_rows: int = 0,
 ):
     """Apply conditional formatting and number formatting."""
-    day_cols = [f"{td.strftime('%m/%d')}({_DOW_JP[td.weekday()]})" for td in week.trading_days]
+    day_cols = _day_col_names(tuple(week.trading_days))
     int_cols = list(day_cols) + ["週間計", "20日平均", "20日最大"]
 
     signed_cols = []  # columns that should show +/- sign
@@ -186,6 +188,9 @@ def _apply_table_styling(
     _LONG_BG = "#dceefb"   # soft blue for Long
     _SHORT_BG = "#fde8e8"  # soft red for Short
 
+    _POSITIVE_CSS = "background-color: #c6efce; color: #006100"
+    _NEGATIVE_CSS = "background-color: #ffc7ce; color: #9c0006"
+
     # Color functions — only apply to participant rows (skip OI header rows)
     def _color_signed(val):
         if pd.isna(val):
@@ -193,19 +198,36 @@ def _apply_table_styling(
         try:
             n = float(val)
             if n > 0:
-                return "background-color: #c6efce; color: #006100"
+                return _POSITIVE_CSS
             elif n < 0:
-                return "background-color: #ffc7ce; color: #9c0006"
+                return _NEGATIVE_CSS
         except (ValueError, TypeError):
             pass
         return ""
 
-    def _color_direction(val):
-        if val == "BUY":
-            return "background-color: #c6efce; color: #006100; font-weight: bold"
-        elif val == "SELL":
-            return "background-color: #ffc7ce; color: #9c0006; font-weight: bold"
-        return ""
+    def _color_signed_block(block: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized _color_signed over a whole subset (NaN compares False)."""
+        vals = block.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        css = np.where(vals > 0, _POSITIVE_CSS, np.where(vals < 0, _NEGATIVE_CSS, ""))
+        return pd.DataFrame(css, index=block.index, columns=block.columns)
+
+    def _color_direction_block(block: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized BUY/SELL highlighting for the direction column."""
+        vals = block.to_numpy(dtype=object)
+        css = np.where(
+            vals == "BUY", f"{_POSITIVE_CSS}; font-weight: bold",
+            np.where(vals == "SELL", f"{_NEGATIVE_CSS}; font-weight: bold", ""),
+        )
+        return pd.DataFrame(css, index=block.index, columns=block.columns)
+
+    def _shade_present_block(css: str):
+        """Vectorized background for every non-missing cell of a subset."""
+        def _block(block: pd.DataFrame) -> pd.DataFrame:
+            return pd.DataFrame(
+                np.where(block.notna().to_numpy(), css, ""),
+                index=block.index, columns=block.columns,
+            )
+        return _block
 
     # Style OI header rows (建玉残高 row: bold blue background, 前日比 row: signed coloring)
     def _style_oi_header(row_idx, val, col):
@@ -224,79 +246,91 @@ def _apply_table_styling(
 
     # Apply OI header row styling
     if oi_header_rows > 0:
+        # Only the header rows are visited; participant rows stay unstyled here
         def _apply_oi_style(s):
-            styles = [""] * len(s)
-            row_idx = s.name
-            if row_idx < oi_header_rows:
-                for i, (col, val) in enumerate(s.items()):
-                    styles[i] = _style_oi_header(row_idx, val, col)
-            return styles
-        styled = styled.apply(_apply_oi_style, axis=1)
+            return [_style_oi_header(s.name, val, col) for col, val in s.items()]
+        styled = styled.apply(
+            _apply_oi_style,
+            axis=1,
+            subset=(list(range(min(oi_header_rows, len(df)))), df.columns),
+        )
+
+    # Participant rows follow the OI header rows; shared by every block below
+    participant_idx = list(range(oi_header_rows, len(df)))
 
     # Apply L/S background color to participant rows
-    if long_cols or short_cols:
-        participant_idx = list(range(oi_header_rows, len(df)))
-        if participant_idx:
-            for col in long_cols:
-                if col in df.columns:
-                    styled = styled.map(
-                        lambda v: f"background-color: {_LONG_BG}" if pd.notna(v) and v != "" else "",
-                        subset=(participant_idx, [col]),
-                    )
-            for col in short_cols:
-                if col in df.columns:
-                    styled = styled.map(
-                        lambda v: f"background-color: {_SHORT_BG}" if pd.notna(v) and v != "" else "",
-                        subset=(participant_idx, [col]),
-                    )
+    if (long_cols or short_cols) and participant_idx:
+        for ls_cols, bg in ((long_cols, _LONG_BG), (short_cols, _SHORT_BG)):
+            valid = [c for c in df.columns if c in ls_cols]
+            if valid:
+                styled = styled.apply(
+                    _shade_present_block(f"background-color: {bg}"),
+                    axis=None,
+                    subset=(participant_idx, valid),
+                )
 
     # Apply sign-based coloring to signed columns (participant rows only)
-    if signed_cols:
-        participant_idx = list(range(oi_header_rows, len(df)))
-        for col in signed_cols:
-            if col in df.columns and participant_idx:
-                styled = styled.map(
-                    _color_signed,
-                    subset=(participant_idx, [col]),
-                )
+    valid_signed = [c for c in signed_cols if c in df.columns]
+    if valid_signed and participant_idx:
+        styled = styled.apply(
+            _color_signed_block,
+            axis=None,
+            subset=(participant_idx, valid_signed),
+        )
 
     # Color direction column (participant rows only)
-    if show_oi and "方向" in df.columns:
-        participant_idx = list(range(oi_header_rows, len(df)))
-        if participant_idx:
-            styled = styled.map(
-                _color_direction,
-                subset=(participant_idx, ["方向"]),
-            )
-
-    # Number formatting
-    fmt_int = lambda v: f"{int(v):,}" if pd.notna(v) and v != "" else "-"
-    fmt_signed = lambda v: f"{int(v):+,}" if pd.notna(v) and v != "" else "-"
-
+    if show_oi and "方向" in df.columns and participant_idx:
+        styled = styled.apply(
+            _color_direction_block,
+            axis=None,
+            subset=(participant_idx, ["方向"]),
+        )
+
+    # Number formatting — one formatter dict, missing values via na_rep
+    formatters = {}
     for col in df.columns:
         if col == "参加者" or col == "方向":
             continue
         if col in signed_cols:
-            styled = styled.format(fmt_signed, subset=[col])
+            formatters[col] = _fmt_signed
         elif col in int_cols:
-            styled = styled.format(fmt_int, subset=[col])
+            formatters[col] = _fmt_int
+    styled = styled.format(formatters, subset=list(formatters), na_rep="-")
 
     return styled
 
 
-def _render_summary_stats(rows: list[WeeklyParticipantRow]) -> None:
+def _fmt_int(v) -> str:
+    return f"{int(v):,}"
+
+
+def _fmt_signed(v) -> str:
+    return f"{int(v):+,}"
+
+
+def _render_summary_stats(
+    rows: list[WeeklyParticipantRow], weekly_totals: list[float],
+) -> None:
     """Render summary metrics below the table."""
     st.markdown("---")
     cols = st.columns(4)
 
-    total_vol = sum(sum(r.daily_volumes.values()) for r in rows)
-    oi_available = any(r.oi_net_change is not None for r in rows)
+    total_vol = sum(weekly_totals)
+
+    # Single pass: OI availability flag, direction counts and net change
+    oi_available = False
+    buyers = sellers = 0
+    total_net = 0.0
+    for r in rows:
+        if r.inferred_direction == "BUY":
+            buyers += 1
+        elif r.inferred_direction == "SELL":
+            sellers += 1
+        if r.oi_net_change is not None:
+            oi_available = True
+            total_net += r.oi_net_change
 
     if oi_available:
-        buyers = sum(1 for r in rows if r.inferred_direction == "BUY")
-        sellers = sum(1 for r in rows if r.inferred_direction == "SELL")
-        total_net = sum(r.oi_net_change for r in rows if r.oi_net_change is not None)
-
         with cols[0]:
             st.metric("買い方", buyers)
         with cols[1]:
@@ -14,11 +14,13 @@ from __future__ import annotations
 
 import math
 from datetime import date
+from functools import lru_cache
 from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)  # standard normal PDF coefficient
 
 
 class GEXProfile(NamedTuple):
@@ -54,34 +56,29 @@ def calc_gex_profile(
     contract_multiplier : 1000 for NK225 options
     """
     T = max((expiry_date - as_of).days, 0) / 365.0
+    sorted_strikes = sorted(strikes)
+    strike_arr, c_oi_arr, p_oi_arr = _oi_arrays(sorted_strikes, put_oi, call_oi)
 
-    records = []
-    for K in sorted(strikes):
-        gamma = _bs_gamma(spot, K, T, sigma, r) if T > 0 else 0.0
-
-        c_oi = call_oi.get(K, 0)
-        p_oi = put_oi.get(K, 0)
-
-        # GEX in notional terms (yen)
-        # Dealer is long gamma on calls sold, short gamma on puts sold
-        call_gex = gamma * c_oi * spot * contract_multiplier
-        put_gex = -gamma * p_oi * spot * contract_multiplier
+    gamma = _bs_gamma(spot, strike_arr, T, sigma, r)
 
-        records.append({
-            "strike": K,
-            "call_gex": call_gex,
-            "put_gex": put_gex,
-            "net_gex": call_gex + put_gex,
-        })
+    # GEX in notional terms (yen)
+    # Dealer is long gamma on calls sold, short gamma on puts sold
+    call_gex = gamma * c_oi_arr * spot * contract_multiplier
+    put_gex = -gamma * p_oi_arr * spot * contract_multiplier
 
-    df = pd.DataFrame(records)
+    df = pd.DataFrame({
+        "strike": sorted_strikes,
+        "call_gex": call_gex,
+        "put_gex": put_gex,
+        "net_gex": call_gex + put_gex,
+    })
 
     total_call = df["call_gex"].sum()
     total_put = df["put_gex"].sum()
     total_net = df["net_gex"].sum()
 
     # Find flip point (net_gex sign change, nearest to spot)
-    flip = _find_flip_point(df, spot)
+    flip = find_flip_point(strike_arr, df["net_gex"].to_numpy(), spot)
 
     return GEXProfile(
         df=df,
@@ -92,6 +89,7 @@ def calc_gex_profile(
     )
 
 
+@lru_cache(maxsize=64)
 def get_sq_date(contract_month: str) -> date:
     """Derive SQ date (2nd Friday) from YYMM contract month string.
 
@@ -106,8 +104,6 @@ def get_sq_date(contract_month: str) -> date:
     # weekday: 0=Mon ... 4=Fri
     days_to_fri = (4 - first_day.weekday()) % 7
     first_friday = first_day.day + days_to_fri
-    if first_friday == 0:
-        first_friday = 7
     second_friday = first_friday + 7
 
     return date(year, mm, second_friday)
@@ -135,62 +131,68 @@ def calc_gex_surface(
     surface : 2-D array shape (len(spots), len(strikes)), net_gex per cell
     """
     T = max((expiry_date - as_of).days, 0) / 365.0
-    sorted_strikes = sorted(strikes)
-    strike_arr = np.array(sorted_strikes, dtype=float)
+    strike_arr, c_oi_arr, p_oi_arr = _oi_arrays(sorted(strikes), put_oi, call_oi)
 
-    spots = np.arange(
-        spot_center - spot_range,
-        spot_center + spot_range + spot_step,
-        spot_step,
-    )
+    # linspace keeps both ends exact; arange can gain or drop the last level to FP drift
+    n_spots = int(round(2 * spot_range / spot_step)) + 1
+    spots = np.linspace(spot_center - spot_range, spot_center + spot_range, n_spots)
 
-    c_oi_arr = np.array([call_oi.get(K, 0) for K in sorted_strikes], dtype=float)
-    p_oi_arr = np.array([put_oi.get(K, 0) for K in sorted_strikes], dtype=float)
+    # Broadcast spots (rows) against strikes (columns) in one pass
+    S = spots[:, None]
+    gamma = _bs_gamma(S, strike_arr[None, :], T, sigma, r)
+    surface = gamma * (c_oi_arr - p_oi_arr) * S * contract_multiplier
 
-    surface = np.zeros((len(spots), len(sorted_strikes)))
+    return spots, strike_arr, surface
 
-    for i, S in enumerate(spots):
-        for j, K in enumerate(sorted_strikes):
-            gamma = _bs_gamma(S, K, T, sigma, r) if T > 0 else 0.0
-            call_gex = gamma * c_oi_arr[j] * S * contract_multiplier
-            put_gex = -gamma * p_oi_arr[j] * S * contract_multiplier
-            surface[i, j] = call_gex + put_gex
 
-    return spots, strike_arr, surface
+def find_flip_point(
+    levels: np.ndarray, net: np.ndarray, spot: float,
+) -> float | None:
+    """Find the level nearest to spot where net GEX crosses zero.
+
+    levels and net are parallel 1-D arrays (strikes or spot levels, sorted
+    ascending); the crossing is linearly interpolated between neighbours.
+    """
+    levels = np.asarray(levels, dtype=float)
+    net = np.asarray(net, dtype=float)
 
+    idx = np.flatnonzero(net[:-1] * net[1:] < 0)  # sign changes
+    if idx.size == 0:
+        return None
 
-# --- Internal ---
+    lo = np.abs(net[idx])
+    hi = np.abs(net[idx + 1])
+    flips = levels[idx] + lo / (lo + hi) * (levels[idx + 1] - levels[idx])
 
-def _bs_gamma(S: float, K: float, T: float, sigma: float, r: float) -> float:
-    """Black-Scholes gamma (same for call and put)."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return 0.0
+    return float(flips[np.argmin(np.abs(flips - spot))])
 
-    sqrt_T = math.sqrt(T)
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
 
-    return norm.pdf(d1) / (S * sigma * sqrt_T)
+# --- Internal ---
+
+def _oi_arrays(
+    sorted_strikes: list[int], put_oi: dict[int, int], call_oi: dict[int, int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (strike_arr, call_oi_arr, put_oi_arr) aligned to sorted_strikes."""
+    strike_arr = np.array(sorted_strikes, dtype=float)
+    c_oi_arr = np.fromiter((call_oi.get(K, 0) for K in sorted_strikes), float, len(sorted_strikes))
+    p_oi_arr = np.fromiter((put_oi.get(K, 0) for K in sorted_strikes), float, len(sorted_strikes))
+    return strike_arr, c_oi_arr, p_oi_arr
 
 
-def _find_flip_point(df: pd.DataFrame, spot: float) -> float | None:
-    """Find the strike nearest to spot where net_gex crosses zero."""
-    if df.empty:
-        return None
+def _bs_gamma(
+    S: np.ndarray, K: np.ndarray, T: float, sigma: float, r: float,
+) -> np.ndarray:
+    """Black-Scholes gamma (same for call and put); S and K broadcast."""
+    S, K = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(K, dtype=float))
+    if T <= 0 or sigma <= 0:
+        return np.zeros(S.shape)
 
-    net = df["net_gex"].values
-    strikes = df["strike"].values
+    sqrt_T = math.sqrt(T)
+    valid = (S > 0) & (K > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        gamma = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1) / (S * sigma * sqrt_T)
 
-    best_flip = None
-    best_dist = float("inf")
+    return np.where(valid, gamma, 0.0)
 
-    for i in range(len(net) - 1):
-        if net[i] * net[i + 1] < 0:  # sign change
-            # Linear interpolation
-            frac = abs(net[i]) / (abs(net[i]) + abs(net[i + 1]))
-            flip_strike = strikes[i] + frac * (strikes[i + 1] - strikes[i])
-            dist = abs(flip_strike - spot)
-            if dist < best_dist:
-                best_dist = dist
-                best_flip = flip_strike
 
-    return best_flip